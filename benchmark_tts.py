@@ -9,17 +9,17 @@ import argparse
 import sys
 import time
 
-import mlx.core as mx
-import numpy as np
-import soundfile as sf
-from mlx_audio.tts.utils import load_model
-
+# The MLX/audio stack takes seconds to import (Metal warmup included), so
+# the heavy imports live inside the functions that need them; --help and
+# argparse errors stay fast.
 
 MODELS = {
+    "0.6B-q4": "mlx-community/Qwen3-TTS-12Hz-0.6B-CustomVoice-4bit",
+    "1.7B-q4": "mlx-community/Qwen3-TTS-12Hz-1.7B-CustomVoice-4bit",
     "0.6B-8bit": "mlx-community/Qwen3-TTS-12Hz-0.6B-CustomVoice-8bit",
     "0.6B": "mlx-community/Qwen3-TTS-12Hz-0.6B-CustomVoice",
     "1.7B-8bit": "mlx-community/Qwen3-TTS-12Hz-1.7B-CustomVoice-8bit",
-    "1.7B": "mlx-community/Qwen3-TTS-12Hz-1.7B-CustomVoice-bf16",
+    "1.7B": "mlx-community/Qwen3-TTS-12Hz-1.7B-CustomVoice-fp16",
 }
 
 TEST_SENTENCES = [
@@ -33,8 +33,58 @@ TEST_SENTENCES = [
 
 SPEAKER = "Ryan"
 
+# Per-sentence results as a structured array (SoA): summary stats become
+# single NumPy reductions and a run can be dumped with np.save for
+# regression tracking
+RESULT_DTYPE = [
+    ("sentence", "i4"),
+    ("chars", "i4"),
+    ("gen_time", "f4"),
+    ("audio_duration", "f4"),
+    ("rtf", "f4"),
+    ("tokens", "i4"),
+]
+
+
+def cast_to_fp16(model):
+    """Cast any bf16 weights to fp16 and materialize the cast eagerly.
+
+    Apple Silicon lacks native bf16 throughput in several Metal ops, so
+    fp16 is the faster master dtype for the memory-bound decode.
+    """
+    import mlx.core as mx
+    from mlx.utils import tree_map
+
+    params = tree_map(
+        lambda p: p.astype(mx.float16) if p.dtype == mx.bfloat16 else p,
+        model.parameters(),
+    )
+    model.update(params)
+    mx.eval(model.parameters())
+
+
+def configure_memory_pool():
+    """Pre-size the MLX unified-memory pool for the whole run.
+
+    KV-cache buffers come and go between sentences; reserving a generous
+    cache up front keeps the Metal heap from growing and shrinking on
+    every generate call.
+    """
+    import mlx.core as mx
+
+    info = mx.metal.device_info()
+    mx.metal.set_memory_limit(int(0.9 * info["max_recommended_working_set_size"]))
+    mx.metal.set_cache_limit(2 * 1024**3)
+
 
 def benchmark_model(model_key):
+    import mlx.core as mx
+    import numpy as np
+    import soundfile as sf
+    from mlx_audio.tts.utils import load_model
+
+    configure_memory_pool()
+
     model_id = MODELS[model_key]
     print(f"\n{'=' * 60}")
     print(f"Model: {model_id}")
@@ -43,10 +93,18 @@ def benchmark_model(model_key):
     print("Loading model...")
     load_start = time.time()
     model = load_model(model_id)
+    # MLX loads weights lazily; force the real I/O + dequant now so it shows
+    # up in load_time instead of inflating the first sentence's gen_time
+    mx.eval(model.parameters())
+    cast_to_fp16(model)
     load_time = time.time() - load_start
     print(f"Model loaded in {load_time:.1f}s")
 
-    results = []
+    # Untimed warmup to pre-compile Metal kernels before the measured loop
+    print("Warming up...")
+    list(model.generate(text="Warmup.", voice=SPEAKER, verbose=False))
+
+    rows = []
     for i, text in enumerate(TEST_SENTENCES, 1):
         print(f"\n--- Sentence {i} ({len(text)} chars) ---")
         print(f"  \"{text[:80]}{'...' if len(text) > 80 else ''}\"")
@@ -57,46 +115,46 @@ def benchmark_model(model_key):
             verbose=False,
         ))
 
-        # Combine segments if multiple
-        audio_arrays = []
-        total_tokens = 0
-        total_proc_time = 0.0
-        sr = None
-        for r in gen_results:
-            audio_np = np.array(r.audio, copy=False)
-            audio_arrays.append(audio_np)
-            total_tokens += r.token_count
-            total_proc_time += r.processing_time_seconds
-            sr = r.sample_rate
-
-        audio = np.concatenate(audio_arrays) if len(audio_arrays) > 1 else audio_arrays[0]
-        audio_duration = len(audio) / sr
+        total_tokens = sum(r.token_count for r in gen_results)
+        total_proc_time = sum(r.processing_time_seconds for r in gen_results)
+        sr = gen_results[-1].sample_rate
+
+        # Stream each segment straight to the WAV writer -- no Python-side
+        # concatenation and no second full-size copy before the write
+        out_path = f"benchmark_{model_key}_{i}.wav"
+        total_samples = 0
+        with sf.SoundFile(out_path, 'w', samplerate=sr, channels=1, subtype='PCM_16') as f:
+            for r in gen_results:
+                # np.asarray is zero-copy from unified memory; fp16 stays
+                # fp16 until here since soundfile can't take float16 input
+                seg = np.asarray(r.audio)
+                if seg.dtype == np.float16:
+                    seg = seg.astype(np.float32)
+                f.write(seg)
+                total_samples += len(seg)
+
+        audio_duration = total_samples / sr
         rtf = total_proc_time / audio_duration
 
-        results.append({
-            "sentence": i,
-            "chars": len(text),
-            "gen_time": total_proc_time,
-            "audio_duration": audio_duration,
-            "rtf": rtf,
-            "tokens": total_tokens,
-        })
+        rows.append((i, len(text), total_proc_time, audio_duration, rtf, total_tokens))
 
-        print(f"  Generation: {total_proc_time:.2f}s")
-        print(f"  Audio duration: {audio_duration:.2f}s")
-        print(f"  Real-time factor: {rtf:.2f}x (< 1.0 = faster than real-time)")
-        print(f"  Tokens: {total_tokens}")
+        # One buffered write per sentence instead of five flushing prints
+        sys.stdout.write("\n".join([
+            f"  Generation: {total_proc_time:.2f}s",
+            f"  Audio duration: {audio_duration:.2f}s",
+            f"  Real-time factor: {rtf:.2f}x (< 1.0 = faster than real-time)",
+            f"  Tokens: {total_tokens}",
+            f"  Saved: {out_path}",
+        ]) + "\n")
 
-        out_path = f"benchmark_{model_key}_{i}.wav"
-        sf.write(out_path, audio, sr)
-        print(f"  Saved: {out_path}")
+    results = np.array(rows, dtype=RESULT_DTYPE)
 
     # Summary
     print(f"\n{'─' * 60}")
     print(f"Summary for {model_key}:")
     print(f"  Model load time: {load_time:.1f}s")
-    total_gen = sum(r["gen_time"] for r in results)
-    total_audio = sum(r["audio_duration"] for r in results)
+    total_gen = results["gen_time"].sum()
+    total_audio = results["audio_duration"].sum()
     print(f"  Total generation: {total_gen:.2f}s for {total_audio:.2f}s of audio")
     print(f"  Average RTF: {total_gen / total_audio:.2f}x")
 
@@ -112,9 +170,9 @@ def main():
     parser.add_argument(
         "models",
         nargs="*",
-        default=["0.6B-8bit"],
+        default=["0.6B-q4"],
         choices=list(MODELS.keys()),
-        help=f"Which model(s) to benchmark (default: 0.6B-8bit). Options: {list(MODELS.keys())}",
+        help=f"Which model(s) to benchmark (default: 0.6B-q4). Options: {list(MODELS.keys())}",
     )
     args = parser.parse_args()
 
@@ -132,14 +190,12 @@ def main():
             traceback.print_exc()
 
     if len(all_results) > 1:
-        print(f"\n{'=' * 60}")
-        print("COMPARISON")
-        print(f"{'=' * 60}")
+        lines = [f"\n{'=' * 60}", "COMPARISON", f"{'=' * 60}"]
         for r in all_results:
-            total_gen = sum(s["gen_time"] for s in r["results"])
-            total_audio = sum(s["audio_duration"] for s in r["results"])
-            avg_rtf = total_gen / total_audio
-            print(f"  {r['model']}: load={r['load_time']:.1f}s  avg RTF={avg_rtf:.2f}x")
+            res = r["results"]
+            avg_rtf = res["gen_time"].sum() / res["audio_duration"].sum()
+            lines.append(f"  {r['model']}: load={r['load_time']:.1f}s  avg RTF={avg_rtf:.2f}x")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     return 0
 
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Combine extracted clips into a single reference WAV for voice cloning.
+Concatenates matching-format WAVs natively with soundfile (no ffmpeg
+subprocess, no temp list file); falls back to ffmpeg if formats differ.
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+import soundfile as sf
+
+
+def combine_clips(clip_files, output_file):
+    """Concatenate WAV clips into output_file.
+
+    Uses a native soundfile read/write loop when every clip shares the
+    first clip's sample rate and channel count; otherwise falls back to
+    ffmpeg's concat filter. Returns the total duration in seconds.
+    """
+    infos = [sf.info(str(c)) for c in clip_files]
+    sr = infos[0].samplerate
+    ch = infos[0].channels
+
+    if all(i.samplerate == sr and i.channels == ch for i in infos):
+        with sf.SoundFile(str(output_file), 'w', samplerate=sr, channels=ch,
+                          subtype='PCM_16') as out:
+            for clip in clip_files:
+                data, _ = sf.read(str(clip), dtype='int16')
+                out.write(data)
+    else:
+        print("Clip formats differ; falling back to ffmpeg concat")
+        _combine_with_ffmpeg(clip_files, output_file)
+
+    return sum(i.duration for i in infos)
+
+
+def _combine_with_ffmpeg(clip_files, output_file):
+    """Concatenate clips via ffmpeg's concat filter.
+
+    The concat filter decodes and resamples each input on its own, which
+    is what mixed sample rates/channel counts need (the concat demuxer
+    assumes every input shares the first file's codec parameters).
+    """
+    cmd = ['ffmpeg', '-y']
+    for clip in clip_files:
+        cmd.extend(['-i', str(clip)])
+
+    inputs = ''.join(f'[{i}:a]' for i in range(len(clip_files)))
+    cmd.extend([
+        '-filter_complex', f'{inputs}concat=n={len(clip_files)}:v=0:a=1',
+        '-ar', '22050',
+        '-ac', '1',
+        str(output_file),
+    ])
+
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                       text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        print(f"Error combining clips: {e}")
+        print(e.stderr)
+        raise
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Combine extracted clips into one reference WAV for voice cloning"
+    )
+    parser.add_argument(
+        "clips",
+        nargs="+",
+        help="Clip WAV files, in playback order"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default="reference.wav",
+        help="Output WAV path (default: reference.wav)"
+    )
+    args = parser.parse_args()
+
+    missing = [c for c in args.clips if not Path(c).exists()]
+    if missing:
+        for c in missing:
+            print(f"Clip not found: {c}")
+        return 1
+
+    duration = combine_clips(args.clips, args.output)
+    print(f"✓ Combined {len(args.clips)} clip(s) -> {args.output} ({duration:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,16 +9,31 @@ import re
 import subprocess
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+# Compiled once at import so repeated calls skip re's per-call cache lookup
+_SLUG_NONWORD = re.compile(r'[^\w\s-]')
+_SLUG_SPACE = re.compile(r'[\s-]+')
+_TIME_RE = re.compile(r'(?:(\d+):)?(\d+(?:\.\d+)?)$')
+
 def slugify(text):
     """Convert a query string to a safe filesystem slug."""
     text = text.lower().strip()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[\s-]+', '_', text)
+    text = _SLUG_NONWORD.sub('', text)
+    text = _SLUG_SPACE.sub('_', text)
     return text.strip('_')
 
 
+def parse_time(time_str):
+    """Parse a clip time: plain seconds ('25', '12.5') or MM:SS ('1:30')."""
+    match = _TIME_RE.match(time_str.strip())
+    if not match:
+        raise ValueError(f"unrecognized time: {time_str!r}")
+    minutes = int(match.group(1)) if match.group(1) else 0
+    return minutes * 60 + float(match.group(2))
+
+
 def check_dependencies():
     """Check if required tools are installed"""
     print("Checking dependencies...")
@@ -85,10 +100,9 @@ def search_youtube(query, max_results=5):
 def download_video(url, output_dir, slug, index):
     """Download YouTube video as audio with a slug-based filename.
 
+    The output directory must already exist.
     Returns the filepath on success, None on failure.
     """
-    Path(output_dir).mkdir(exist_ok=True)
-
     filename = f"{slug}_{index:02d}.%(ext)s"
     output_template = f"{output_dir}/{filename}"
 
@@ -103,7 +117,8 @@ def download_video(url, output_dir, slug, index):
 
     print(f"\nDownloading from: {url}")
     try:
-        subprocess.run(cmd, capture_output=True, text=True, check=True)
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                       text=True, check=True)
 
         expected = Path(output_dir) / f"{slug}_{index:02d}.wav"
         if expected.exists():
@@ -135,49 +150,186 @@ def write_manifest(output_dir, slug, entries):
             f.write(f"| {entry['file']} | {entry['id']} | {entry['title']} | {entry['url']} |\n")
     print(f"✓ Manifest written: {manifest_path}")
 
-def extract_clip(input_file, start_time, end_time, output_file, apply_filters=True):
+# Audio filters applied to each clip:
+# - highpass: remove low rumble (80Hz and below)
+# - lowpass: remove high hiss (8000Hz and above)
+# - afftdn: adaptive noise reduction
+# - loudnorm: normalize loudness
+# The first three are range-independent and safe to run once over a whole
+# source file; loudnorm depends on the clip's own content so it stays per-clip.
+PREPASS_FILTERS = ','.join([
+    'highpass=f=80',
+    'lowpass=f=8000',
+    'afftdn=nf=-25',
+])
+LOUDNORM_FILTER = 'loudnorm=I=-16:TP=-1.5:LRA=11'
+CLIP_FILTERS = PREPASS_FILTERS + ',' + LOUDNORM_FILTER
+
+def prepare_filtered_source(audio_file):
+    """Run the range-independent filters over the whole source once.
+
+    Produces a cached 22.05kHz mono wav next to the source with
+    highpass/lowpass/afftdn already applied, so each clip extraction only
+    has to slice it and apply loudnorm. The cache is reused when it is
+    newer than the source. Returns the cache path, or None on failure.
+    """
+    source = Path(audio_file)
+    cache = source.with_name(f".{source.stem}_filtered.wav")
+    if cache.exists() and cache.stat().st_mtime >= source.stat().st_mtime:
+        print(f"Using cached filtered source: {cache}")
+        return str(cache)
+
+    cmd = [
+        'ffmpeg', '-y',
+        '-i', str(source),
+        '-af', PREPASS_FILTERS,
+        '-ar', '22050',
+        '-ac', '1',
+        str(cache)
+    ]
+
+    print(f"Pre-filtering source (one-time pass): {source.name} -> {cache.name}")
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                       text=True, check=True)
+        return str(cache)
+    except subprocess.CalledProcessError as e:
+        print(f"Error pre-filtering source: {e}")
+        print(e.stderr)
+        return None
+
+def extract_clip(input_file, start_time, end_time, output_file, filters=CLIP_FILTERS):
     """Extract a clip from the audio file with optional noise reduction"""
     duration = end_time - start_time
-    
-    # Build ffmpeg command
+
+    # -ss before -i does a fast input-side seek instead of decoding
+    # everything up to start_time
     cmd = [
         'ffmpeg',
-        '-i', input_file,
         '-ss', str(start_time),
         '-t', str(duration),
+        '-i', input_file,
     ]
-    
-    if apply_filters:
-        # Apply audio filters:
-        # - highpass: remove low rumble (80Hz and below)
-        # - lowpass: remove high hiss (8000Hz and above)
-        # - afftdn: adaptive noise reduction
-        # - loudnorm: normalize loudness
-        filters = [
-            'highpass=f=80',
-            'lowpass=f=8000',
-            'afftdn=nf=-25',
-            'loudnorm=I=-16:TP=-1.5:LRA=11'
-        ]
-        cmd.extend(['-af', ','.join(filters)])
-    
+
+    if filters:
+        cmd.extend(['-af', filters])
+
     cmd.extend([
         '-ar', '22050',  # 22.05kHz sample rate (good for speech)
         '-ac', '1',  # Mono
         '-y',  # Overwrite output
         output_file
     ])
-    
+
     print(f"Extracting clip: {start_time}s - {end_time}s -> {output_file}")
-    
+
     try:
-        subprocess.run(cmd, capture_output=True, check=True)
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                       text=True, check=True)
         print(f"✓ Extracted: {output_file}")
         return True
     except subprocess.CalledProcessError as e:
         print(f"Error extracting clip: {e}")
+        print(e.stderr)
+        return False
+
+def extract_clips_batch(input_file, ranges, output_files, filters=CLIP_FILTERS):
+    """Extract several clips with a single ffmpeg invocation.
+
+    The source is opened and decoded once; each (start, end) range in
+    `ranges` becomes its own output file with the filter chain applied
+    per clip. Returns True if all clips were extracted.
+    """
+    cmd = ['ffmpeg', '-y', '-i', input_file]
+    for (start, end), output_file in zip(ranges, output_files):
+        cmd.extend(['-ss', str(start), '-t', str(end - start), '-map', '0:a'])
+        if filters:
+            cmd.extend(['-af', filters])
+        cmd.extend(['-ar', '22050', '-ac', '1', output_file])
+
+    print(f"Extracting {len(ranges)} clip(s) from {input_file}...")
+
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                       text=True, check=True)
+        for output_file in output_files:
+            print(f"✓ Extracted: {output_file}")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"Error extracting clips: {e}")
+        print(e.stderr)
         return False
 
+def extract_ranges(audio_file, ranges, output_files, output_dir):
+    """Extract all queued ranges from audio_file in one ffmpeg pass.
+
+    Denoises the whole source once up front so each clip only needs a
+    slice plus its own loudness normalization. Returns the clip count.
+    """
+    extracted = 0
+    if ranges:
+        filtered_source = prepare_filtered_source(audio_file)
+        if filtered_source:
+            source_file, filters = filtered_source, LOUDNORM_FILTER
+        else:
+            source_file, filters = audio_file, CLIP_FILTERS
+
+        if extract_clips_batch(source_file, ranges, output_files, filters=filters):
+            extracted = len(ranges)
+
+    print(f"\n✓ Extracted {extracted} clips to {output_dir}/")
+    return extracted
+
+def load_batch_ranges(batch_file):
+    """Parse a timestamps file into validated (start, end) ranges.
+
+    Each non-blank line is 'START END' in the same formats the interactive
+    prompt accepts; '#' starts a comment. Bad lines are reported and skipped.
+    """
+    ranges = []
+    with open(batch_file) as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+
+            parts = line.split()
+            if len(parts) != 2:
+                print(f"{batch_file}:{lineno}: expected 'START END', got: {line}")
+                continue
+
+            try:
+                start, end = parse_time(parts[0]), parse_time(parts[1])
+            except ValueError as e:
+                print(f"{batch_file}:{lineno}: {e}")
+                continue
+
+            if start >= end:
+                print(f"{batch_file}:{lineno}: start must be before end: {line}")
+                continue
+
+            ranges.append((start, end))
+    return ranges
+
+def batch_clip_extraction(audio_file, batch_file, output_dir="clips", start_number=1):
+    """Extract a clip for every time range listed in batch_file.
+
+    Returns the number of clips extracted.
+    """
+    Path(output_dir).mkdir(exist_ok=True)
+
+    ranges = load_batch_ranges(batch_file)
+    if not ranges:
+        print(f"No valid ranges found in {batch_file}")
+        return 0
+
+    print(f"Loaded {len(ranges)} range(s) from {batch_file}")
+    output_files = [
+        f"{output_dir}/clip_{n:02d}.wav"
+        for n in range(start_number, start_number + len(ranges))
+    ]
+    return extract_ranges(audio_file, ranges, output_files, output_dir)
+
 def interactive_clip_extraction(audio_file, output_dir="clips", start_number=1):
     """Interactively extract clips from an audio file.
 
@@ -189,62 +341,56 @@ def interactive_clip_extraction(audio_file, output_dir="clips", start_number=1):
     print("CLIP EXTRACTION MODE")
     print(f"{'='*60}")
     print(f"Source file: {audio_file}")
-    print("\nYou can now extract specific time ranges as clips.")
+    print("\nYou can now queue specific time ranges as clips.")
     print("Enter times in format: START END (in seconds)")
     print("Examples:")
-    print("  10 25     - Extract from 10s to 25s")
-    print("  1:30 1:45 - Extract from 1min 30s to 1min 45s")
-    print("\nType 'done' when finished, 'help' for commands")
+    print("  10 25     - Queue clip from 10s to 25s")
+    print("  1:30 1:45 - Queue clip from 1min 30s to 1min 45s")
+    print("\nType 'done' to extract all queued clips, 'help' for commands")
 
     clip_number = start_number
-    
+    ranges = []
+    output_files = []
+
     while True:
         print(f"\n--- Clip {clip_number} ---")
         user_input = input("Enter time range (START END) or command: ").strip().lower()
-        
+
         if user_input == 'done':
             break
         elif user_input == 'help':
             print("\nCommands:")
-            print("  START END - Extract clip (e.g., '10 25' or '1:30 1:45')")
-            print("  done      - Finish and exit")
+            print("  START END - Queue clip (e.g., '10 25' or '1:30 1:45')")
+            print("  done      - Extract all queued clips and exit")
             print("  help      - Show this help")
             continue
         elif not user_input:
             continue
-        
+
         try:
             parts = user_input.split()
             if len(parts) != 2:
                 print("Please enter exactly two times: START END")
                 continue
-            
-            # Parse time format (supports "seconds" or "MM:SS")
-            def parse_time(time_str):
-                if ':' in time_str:
-                    parts = time_str.split(':')
-                    return int(parts[0]) * 60 + float(parts[1])
-                return float(time_str)
-            
+
             start = parse_time(parts[0])
             end = parse_time(parts[1])
-            
+
             if start >= end:
                 print("Start time must be before end time!")
                 continue
-            
+
             output_file = f"{output_dir}/clip_{clip_number:02d}.wav"
-            
-            if extract_clip(audio_file, start, end, output_file):
-                clip_number += 1
-            
+            ranges.append((start, end))
+            output_files.append(output_file)
+            print(f"Queued clip {clip_number}: {start}s - {end}s -> {output_file}")
+            clip_number += 1
+
         except ValueError as e:
             print(f"Invalid time format: {e}")
             print("Use format: 10 25  or  1:30 1:45")
-    
-    extracted = clip_number - start_number
-    print(f"\n✓ Extracted {extracted} clips to {output_dir}/")
-    return extracted
+
+    return extract_ranges(audio_file, ranges, output_files, output_dir)
 
 def main():
     parser = argparse.ArgumentParser(
@@ -266,11 +412,21 @@ def main():
         default="output",
         help="Base output directory (default: output). Downloads go to <dir>/downloads/, clips to <dir>/clips/"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Number of simultaneous downloads (default: 4)"
+    )
     parser.add_argument(
         "--clip",
         action="store_true",
         help="Skip search/download and extract clips from existing files in the downloads directory"
     )
+    parser.add_argument(
+        "--batch-file",
+        help="File of 'START END' time ranges (one clip per line) to extract non-interactively"
+    )
     args = parser.parse_args()
 
     download_dir = Path(args.output_dir) / "downloads"
@@ -286,7 +442,12 @@ def main():
             print(f"\nNo downloads directory found at {download_dir}")
             return 1
 
-        downloaded_files = sorted(download_dir.glob("*.wav"))
+        # Path.glob matches dotfiles, so skip the hidden ._filtered caches
+        # left by prepare_filtered_source -- re-filtering them would stack
+        # the denoise chain twice and spawn caches of caches
+        downloaded_files = sorted(
+            f for f in download_dir.glob("*.wav") if not f.name.startswith('.')
+        )
         if not downloaded_files:
             print(f"\nNo .wav files found in {download_dir}")
             return 1
@@ -346,11 +507,23 @@ def main():
             except ValueError:
                 print("Please enter numbers separated by spaces, 'all', or 'q'")
 
-        # Download selected videos
+        # Download selected videos concurrently -- downloads are bound by
+        # network throughput, so wall time drops to roughly the slowest one
+        download_dir.mkdir(parents=True, exist_ok=True)
+        download_results = {}
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            futures = {
+                pool.submit(download_video, video['url'], str(download_dir), slug, i): i
+                for i, video in enumerate(selected_videos, 1)
+            }
+            for future in as_completed(futures):
+                download_results[futures[future]] = future.result()
+
+        # Collect results in selection order so manifest rows stay stable
         manifest_entries = []
         downloaded_files = []
         for i, video in enumerate(selected_videos, 1):
-            audio_file = download_video(video['url'], str(download_dir), slug, i)
+            audio_file = download_results.get(i)
             if audio_file:
                 downloaded_files.append(audio_file)
                 manifest_entries.append({
@@ -401,13 +574,18 @@ def main():
             if audio_file is None:
                 break
 
-        num_clips = interactive_clip_extraction(
-            audio_file, output_dir=str(clip_dir), start_number=next_clip
-        )
+        if args.batch_file:
+            num_clips = batch_clip_extraction(
+                audio_file, args.batch_file, output_dir=str(clip_dir), start_number=next_clip
+            )
+        else:
+            num_clips = interactive_clip_extraction(
+                audio_file, output_dir=str(clip_dir), start_number=next_clip
+            )
         total_clips += num_clips
         next_clip += num_clips
 
-        if len(downloaded_files) == 1:
+        if len(downloaded_files) == 1 or args.batch_file:
             break
 
         another = input("\nExtract clips from another file? (y/n): ").strip().lower()
@@ -9,17 +9,17 @@ import sys
 import time
 from pathlib import Path
 
-import mlx.core as mx
-import numpy as np
-import soundfile as sf
-from mlx_audio.tts.utils import load_model
-
+# The MLX/audio stack takes seconds to import (Metal warmup included), so
+# the heavy imports live inside the functions that need them; --help and
+# argparse errors stay fast.
 
 MODELS = {
+    "0.6B-q4": "mlx-community/Qwen3-TTS-12Hz-0.6B-Base-4bit",
+    "1.7B-q4": "mlx-community/Qwen3-TTS-12Hz-1.7B-Base-4bit",
     "0.6B-8bit": "mlx-community/Qwen3-TTS-12Hz-0.6B-Base-8bit",
-    "0.6B-bf16": "mlx-community/Qwen3-TTS-12Hz-0.6B-Base-bf16",
+    "0.6B-fp16": "mlx-community/Qwen3-TTS-12Hz-0.6B-Base-fp16",
     "1.7B-8bit": "mlx-community/Qwen3-TTS-12Hz-1.7B-Base-8bit",
-    "1.7B-bf16": "mlx-community/Qwen3-TTS-12Hz-1.7B-Base-bf16",
+    "1.7B-fp16": "mlx-community/Qwen3-TTS-12Hz-1.7B-Base-fp16",
 }
 
 # Reference clips with hand-written transcripts (longest clips first)
@@ -48,18 +48,75 @@ TEST_SENTENCES = [
 OUTPUT_DIR = Path("clone_outputs")
 
 
+# Decoded reference waveforms, keyed by (path, sample_rate). run_clone_test
+# runs up to 2 modes x 3 sentences against the same clip, and mlx_audio
+# re-reads ref_audio from disk on every generate call when handed a path.
+_REF_AUDIO_CACHE = {}
+
+
+def load_ref_audio(path, sample_rate):
+    """Decode a reference clip once per process and reuse the samples.
+
+    Decoding goes through mlx_audio's loader so the clip is resampled to
+    the model's rate: raw samples passed to generate skip the resampling a
+    path argument would get, and this project's clips are 22.05kHz by
+    construction while the speaker encoder expects the model rate.
+    mlx_audio does not expose its reference-encoder state for reuse across
+    generate calls, so the decode+resample is the repeated per-sentence
+    cost we can actually eliminate at this layer.
+    """
+    import mlx.core as mx
+    import numpy as np
+    from mlx_audio.utils import load_audio
+
+    key = (path, sample_rate)
+    audio = _REF_AUDIO_CACHE.get(key)
+    if audio is not None:
+        return audio
+
+    # On-disk sidecar so repeated invocations (4 models x 2 modes) skip the
+    # decode too; the name embeds the target rate so a sidecar written for
+    # another rate never validates, and editing the clip invalidates it
+    src = Path(path)
+    sidecar = src.with_name(f".{src.stem}.ref{sample_rate}.npy")
+    if sidecar.exists() and sidecar.stat().st_mtime >= src.stat().st_mtime:
+        audio = mx.array(np.load(sidecar))
+    else:
+        audio = load_audio(path, sample_rate=sample_rate)
+        np.save(sidecar, np.asarray(audio))
+
+    _REF_AUDIO_CACHE[key] = audio
+    return audio
+
+
+def cast_to_fp16(model):
+    """Cast any bf16 weights to fp16 and materialize the cast eagerly.
+
+    fp16 over bf16: Apple Silicon has no fast bf16 path in several Metal ops.
+    """
+    import mlx.core as mx
+    from mlx.utils import tree_map
+
+    params = tree_map(
+        lambda p: p.astype(mx.float16) if p.dtype == mx.bfloat16 else p,
+        model.parameters(),
+    )
+    model.update(params)
+    mx.eval(model.parameters())
+
+
 def run_clone_test(model, model_key, clip_key, clip_info, use_transcript=True):
     """Run voice cloning with a single reference clip and generate test sentences."""
-    ref_audio = clip_info["path"]
+    import numpy as np
+    import soundfile as sf
+
+    ref_audio = load_ref_audio(clip_info["path"], model.sample_rate)
     ref_text = clip_info["transcript"] if use_transcript else None
-    mode = "transcript" if (use_transcript and ref_text) else "xvector"
+    mode = "transcript" if use_transcript else "xvector"
 
     print(f"\n  --- Ref: {clip_key} ({clip_info['duration']}) | Mode: {mode} ---")
 
-    if use_transcript and ref_text is None:
-        print(f"    Skipping transcript mode (no transcript provided for {clip_key})")
-        return None
-
+    # The mkdir stays ahead of the loop: every sentence writes into out_dir
     out_dir = OUTPUT_DIR / model_key / f"{clip_key}_{mode}"
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -74,20 +131,25 @@ def run_clone_test(model, model_key, clip_key, clip_info, use_transcript=True):
             verbose=False,
         ))
 
-        audio_arrays = []
-        total_proc_time = 0.0
-        sr = None
-        for r in gen_results:
-            audio_arrays.append(np.array(r.audio, copy=False))
-            total_proc_time += r.processing_time_seconds
-            sr = r.sample_rate
-
-        audio = np.concatenate(audio_arrays) if len(audio_arrays) > 1 else audio_arrays[0]
-        audio_duration = len(audio) / sr
-        rtf = total_proc_time / audio_duration
+        total_proc_time = sum(r.processing_time_seconds for r in gen_results)
+        sr = gen_results[-1].sample_rate
 
+        # Stream each segment straight to the WAV writer -- no Python-side
+        # concatenation and no second full-size copy before the write
         out_path = out_dir / f"sentence_{i}.wav"
-        sf.write(str(out_path), audio, sr)
+        total_samples = 0
+        with sf.SoundFile(str(out_path), 'w', samplerate=sr, channels=1, subtype='PCM_16') as f:
+            for r in gen_results:
+                # np.asarray is zero-copy from unified memory; fp16 stays
+                # fp16 until here since soundfile can't take float16 input
+                seg = np.asarray(r.audio)
+                if seg.dtype == np.float16:
+                    seg = seg.astype(np.float32)
+                f.write(seg)
+                total_samples += len(seg)
+
+        audio_duration = total_samples / sr
+        rtf = total_proc_time / audio_duration
 
         results.append({
             "gen_time": total_proc_time,
@@ -102,7 +164,26 @@ def run_clone_test(model, model_key, clip_key, clip_info, use_transcript=True):
     return {"clip": clip_key, "mode": mode, "avg_rtf": avg_rtf, "results": results}
 
 
+def configure_memory_pool():
+    """Pre-size the MLX unified-memory pool for the whole run.
+
+    KV-cache buffers come and go between sentences; reserving a generous
+    cache up front keeps the Metal heap from growing and shrinking on
+    every generate call.
+    """
+    import mlx.core as mx
+
+    info = mx.metal.device_info()
+    mx.metal.set_memory_limit(int(0.9 * info["max_recommended_working_set_size"]))
+    mx.metal.set_cache_limit(2 * 1024**3)
+
+
 def benchmark_model(model_key, clips_to_test):
+    import mlx.core as mx
+    from mlx_audio.tts.utils import load_model
+
+    configure_memory_pool()
+
     model_id = MODELS[model_key]
     print(f"\n{'=' * 60}")
     print(f"Model: {model_id}")
@@ -111,9 +192,27 @@ def benchmark_model(model_key, clips_to_test):
     print("Loading model...")
     load_start = time.time()
     model = load_model(model_id)
+    # MLX loads weights lazily; force the real I/O + dequant now so it shows
+    # up in load_time instead of inflating the first sentence's gen_time
+    mx.eval(model.parameters())
+    cast_to_fp16(model)
     load_time = time.time() - load_start
     print(f"Model loaded in {load_time:.1f}s")
 
+    # The first generate call per model pays Metal kernel compilation; run
+    # it once untimed so per-sentence numbers measure steady-state decode
+    for clip_key in clips_to_test:
+        clip_info = REFERENCE_CLIPS[clip_key]
+        if Path(clip_info["path"]).exists():
+            print("Warming up...")
+            list(model.generate(
+                text="Warmup.",
+                ref_audio=load_ref_audio(clip_info["path"], model.sample_rate),
+                ref_text=None,
+                verbose=False,
+            ))
+            break
+
     all_test_results = []
 
     for clip_key in clips_to_test:
@@ -144,9 +243,9 @@ def main():
     parser.add_argument(
         "models",
         nargs="*",
-        default=["0.6B-8bit"],
+        default=["0.6B-q4"],
         choices=list(MODELS.keys()),
-        help=f"Which model(s) to test (default: 0.6B-8bit). Options: {list(MODELS.keys())}",
+        help=f"Which model(s) to test (default: 0.6B-q4). Options: {list(MODELS.keys())}",
     )
     parser.add_argument(
         "--clips",
@@ -159,6 +258,7 @@ def main():
 
     print("Qwen3-TTS Voice Cloning Test (MLX)")
     print(f"Output directory: {OUTPUT_DIR}/")
+    OUTPUT_DIR.mkdir(exist_ok=True)
 
     all_results = []
     for model_key in args.models:
@@ -170,15 +270,14 @@ def main():
             import traceback
             traceback.print_exc()
 
-    # Summary
+    # Summary, assembled once and written with a single call
     if all_results:
-        print(f"\n{'=' * 60}")
-        print("SUMMARY")
-        print(f"{'=' * 60}")
+        lines = [f"\n{'=' * 60}", "SUMMARY", f"{'=' * 60}"]
         for r in all_results:
-            print(f"\n  {r['model']} (load: {r['load_time']:.1f}s):")
+            lines.append(f"\n  {r['model']} (load: {r['load_time']:.1f}s):")
             for t in r["tests"]:
-                print(f"    {t['clip']} [{t['mode']}]: avg RTF {t['avg_rtf']:.2f}x")
+                lines.append(f"    {t['clip']} [{t['mode']}]: avg RTF {t['avg_rtf']:.2f}x")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     print(f"\nAll outputs saved to {OUTPUT_DIR}/")
     print("Listen and compare quality across models and clips!")